@@ -1,9 +1,11 @@
 # -*- coding: utf-8 -*-
 
 import enum
+import inspect
+import logging
 import weakref
 
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Tuple
 
 from .mpl import (
     FigureCanvas,
@@ -148,6 +150,25 @@ def _get_mpl_figure(mpl_obj: MplObject_Type) -> Figure:
     return figure
 
 
+def _mpl_disconnect(figure_ref: 'weakref.ref[Figure]', id_box: List[int]):
+    cid = id_box[0]
+    if cid <= 0:
+        return
+
+    figure = figure_ref()
+    if figure is not None:
+        figure.canvas.mpl_disconnect(cid)
+
+
+def _make_handler_finalizer(conn_ref: 'weakref.ref[MplEventConnection]'):
+    def finalizer(_):
+        conn = conn_ref()
+        if conn is not None:
+            logger.debug('The handler object of %s has been destroyed', conn)
+            conn.disconnect()
+    return finalizer
+
+
 class MplEventConnection:
     """Implements the connection to matplotlib event
 
@@ -166,6 +187,11 @@ class MplEventConnection:
     connect : bool
         If this flag is True, event and handler will be connected immediately
 
+    .. note::
+        If the handler is a bound method, the connection holds only a weak reference to it
+        after the first connection. The connection will be disconnected automatically
+        when the method object is destroyed.
+
     Attributes
     ----------
     figure
@@ -198,21 +224,25 @@ class MplEventConnection:
 
     """
 
+    __slots__ = ('_figure', '_event', '_event_name', '_handler', '_id_box', '_finalizer', '__weakref__')
+
     def __init__(self, mpl_obj: MplObject_Type,
                  event: MplEvent,
                  handler: EventHandler_Type,
                  connect: bool = True):
         self._figure = weakref.ref(_get_mpl_figure(mpl_obj))
         self._event = event
+        self._event_name = event.value
+        self._id_box = [-1]
         self._handler = handler
-        self._id = -1
+
+        # The finalizer disconnects the handler when the connection object is destroyed
+        self._finalizer = weakref.finalize(self, _mpl_disconnect, self._figure, self._id_box)
+        self._finalizer.atexit = False
 
         if connect:
             self.connect()
 
-    def __del__(self):
-        self.disconnect()
-
     def __repr__(self) -> str:
         return '{}(event=<{}:{}>, handler={}, id={})'.format(
             type(self).__name__, self.event.name,
@@ -241,14 +271,17 @@ class MplEventConnection:
         return self._event
 
     @property
-    def handler(self) -> EventHandler_Type:
+    def handler(self) -> Optional[EventHandler_Type]:
         """Returns the event handler callable
 
         Returns
         -------
-        handler : callable
+        handler : callable, None
             Event handler callable that is related to this connection
+            or None if the handler is a bound method and its object has been destroyed
         """
+        if isinstance(self._handler, weakref.WeakMethod):
+            return self._handler()
         return self._handler
 
     @property
@@ -260,7 +293,7 @@ class MplEventConnection:
         id : int
             Matplotlib connection identifier
         """
-        return self._id
+        return self._id_box[0]
 
     @property
     def valid(self) -> bool:
@@ -273,7 +306,7 @@ class MplEventConnection:
         valid : bool
             True if the connection is valid
         """
-        return self.figure is not None
+        return self._figure() is not None
 
     @property
     def connected(self) -> bool:
@@ -284,33 +317,66 @@ class MplEventConnection:
         connected : bool
             True if the handler is connected to the event
         """
-        return self._id > 0 and self.valid
+        return self._id_box[0] > 0 and self._figure() is not None
 
     def connect(self):
         """Connects the handler to the event
         """
-        if not self.valid:
+        figure = self._figure()
+        if figure is None:
             logger.error('Figure ref is dead')
-            self._id = -1
+            self._id_box[0] = -1
             return
 
-        if self.connected:
-            return
-
-        self._id = self.figure.canvas.mpl_connect(self._event.value, self._handler)
-        logger.debug('"%s" was connected to %s handler (id=%d)',
-                     self.event.value, self._handler, self._id)
+        self._connect_on(figure.canvas)
 
     def disconnect(self):
         """Disconnects the handler from the event
         """
-        if not self.connected:
+        if self._id_box[0] <= 0:
+            return
+
+        figure = self._figure()
+        if figure is None:
+            self._id_box[0] = -1
             return
 
-        self.figure.canvas.mpl_disconnect(self._id)
-        logger.debug('"%s" was disconnected from %s handler (id=%d)',
-                     self.event.value, self._handler, self._id)
-        self._id = -1
+        self._disconnect_on(figure.canvas)
+
+    def _connect_on(self, canvas: FigureCanvas):
+        if self._id_box[0] > 0:
+            return
+
+        handler = self.handler
+        if handler is None:
+            logger.error('Handler object is dead')
+            return
+
+        if inspect.ismethod(self._handler):
+            # The weak reference to the bound method is created lazily on the first connection
+            try:
+                self._handler = weakref.WeakMethod(handler, _make_handler_finalizer(weakref.ref(self)))
+            except TypeError:
+                # The method object does not support weak references (e.g. "__slots__" without "__weakref__")
+                pass
+
+        # matplotlib holds bound methods weakly, so the handler object is not kept alive
+        cid = self._id_box[0] = canvas.mpl_connect(self._event_name, handler)
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('"%s" was connected to %s handler (id=%d)',
+                         self._event_name, self.handler, cid)
+
+    def _disconnect_on(self, canvas: FigureCanvas):
+        cid = self._id_box[0]
+        if cid <= 0:
+            return
+
+        canvas.mpl_disconnect(cid)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug('"%s" was disconnected from %s handler (id=%d)',
+                         self._event_name, self.handler, cid)
+        self._id_box[0] = -1
 
 
 def mpl_event_handler(event_type: MplEvent):
@@ -334,21 +400,12 @@ def mpl_event_handler(event_type: MplEvent):
             def on_my_key_press(self, event: mpl.KeyPress):
                 pass
     """
-    class HandlerDescriptor:
-        """Adds handler method name to event handlers mapping
-        """
-        def __init__(self, handler):
-            self.handler = handler
-
-        def __get__(self, obj, cls=None):
-            return self.handler.__get__(obj, cls)
-
-        def __set_name__(self, owner, name):
-            if 'mpl_event_handlers' not in owner.__dict__:
-                owner.mpl_event_handlers = getattr(owner, 'mpl_event_handlers', {}).copy()
-            owner.mpl_event_handlers[event_type] = name
+    def decorator(handler):
+        # The marked handlers are added to event handlers mapping in MplEventDispatcher.__init_subclass__
+        handler._mpl_event = event_type
+        return handler
 
-    return HandlerDescriptor
+    return decorator
 
 
 class MplEventDispatcher:
@@ -401,10 +458,27 @@ class MplEventDispatcher:
         figure = plt.figure()
         dispatcher = KeyEventDispatcher(figure)
         plt.show()
+
+    .. note::
+        The class defines ``__slots__`` with ``__weakref__`` and ``__dict__``,
+        so the subclasses can have arbitrary instance attributes and
+        the dispatchers can be weakly referenced (e.g. by event filters).
+
+    .. note::
+        The event handlers are resolved once when a dispatcher class is created.
+        The handler methods must be defined in the class body (or in base classes/mixins).
+        A handler that is assigned to the class after its creation
+        (e.g. ``MyDispatcher.on_key_press = func``) will not be connected.
+
     """
 
+    __slots__ = ('_figure', '_mpl_connections', '_event_filters', '_orig_mpl_connections',
+                 '_ever_connected', '__weakref__', '__dict__')
+
     mpl_event_handlers: Dict[MplEvent, str] = {}
 
+    _handler_items: Tuple[Tuple[MplEvent, str], ...] = ()
+
     disable_default_handlers: bool = False
     """If flag is True default handlers will be disabled
 
@@ -419,36 +493,60 @@ class MplEventDispatcher:
 
         self._event_filters: List[EventFilter_Type] = []
         self._orig_mpl_connections = {}
+        self._ever_connected = False
 
         if self.disable_default_handlers:
             disable_default_key_press_handler(mpl_obj)
         if connect:
             self.mpl_connect()
 
-    def __del__(self):
-        self.mpl_disconnect()
-
-    def _make_mpl_connections(self) -> Dict[MplEvent, MplEventConnection]:
-        conns = {}
-
-        for event, handler_name in self.mpl_event_handlers.items():
-            handler = self._get_handler(handler_name)
-            if handler:
-                conn = event.make_connection(self.figure, handler, connect=False)
-                conns[event] = conn
-
-        return conns
-
-    def _get_handler(self, handler_name: str) -> Optional[EventHandler_Type]:
-        for cls in type(self).__mro__:
-            if cls is not MplEventDispatcher and handler_name in cls.__dict__:
-                handler = getattr(self, handler_name)
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._update_event_handlers()
+        # The handlers are resolved once per class after the event handlers mapping has been updated
+        cls._handler_items = cls._resolve_handler_items()
+
+    @classmethod
+    def _update_event_handlers(cls):
+        # The mapping from the class body or the already resolved mapping of the parent class
+        event_handlers = dict(cls.mpl_event_handlers)
+
+        # The classes below MplEventDispatcher in MRO or MplEventDispatcher itself for the base class
+        mro = cls.__mro__[:cls.__mro__.index(MplEventDispatcher)] or (cls,)
+
+        # The marked handlers from derived classes and mixins override the handlers from base classes
+        for c in reversed(mro):
+            for name, handler in c.__dict__.items():
+                event = getattr(handler, '_mpl_event', None)
+                if isinstance(event, MplEvent):
+                    event_handlers[event] = name
+
+        cls.mpl_event_handlers = event_handlers
+
+    @classmethod
+    def _resolve_handler_items(cls) -> Tuple[Tuple[MplEvent, str], ...]:
+        handler_items = []
+        mro = cls.__mro__[:cls.__mro__.index(MplEventDispatcher)]
+
+        for event, handler_name in cls.mpl_event_handlers.items():
+            if any(handler_name in c.__dict__ for c in mro):
+                handler = getattr(cls, handler_name)
                 if callable(handler):
                     logger.debug('Found event handler: %s', handler)
-                    return handler
+                    handler_items.append((event, handler_name))
                 else:
                     logger.warning('"%s": %s is not callable', handler_name, handler)
 
+        return tuple(handler_items)
+
+    def _make_mpl_connections(self) -> Dict[MplEvent, MplEventConnection]:
+        figure = self._figure()
+
+        return {
+            event: MplEventConnection(figure, event, getattr(self, handler_name), connect=False)
+            for event, handler_name in self._handler_items
+        }
+
     def _event_filter_proxy(self, event: MplEvent_Type):
         for event_filter in self._event_filters:
             if event_filter(self, event):
@@ -477,7 +575,7 @@ class MplEventDispatcher:
         valid : bool
             True if the dispatcher is valid
         """
-        return self.figure is not None
+        return self._figure() is not None
 
     @property
     def mpl_connections(self) -> Dict[MplEvent, MplEventConnection]:
@@ -511,22 +609,30 @@ class MplEventDispatcher:
     def mpl_connect(self):
         """Connects the implemented event handlers to the related matplotlib events for this instance
         """
-        if not self.valid:
+        figure = self._figure()
+        if figure is None:
             logger.error('The figure ref is dead')
             return
 
-        self.mpl_disconnect()
+        if self._ever_connected:
+            self.mpl_disconnect()
+
+        canvas = figure.canvas
         for conn in self._mpl_connections.values():
-            conn.connect()
+            conn._connect_on(canvas)
+
+        self._ever_connected = True
 
     def mpl_disconnect(self):
         """Disconnects the implemented handlers from the related matplotlib events for this instance
         """
-        if not self.valid:
+        figure = self._figure()
+        if figure is None:
             return
 
+        canvas = figure.canvas
         for conn in self._mpl_connections.values():
-            conn.disconnect()
+            conn._disconnect_on(canvas)
 
     def add_event_filter(self, filter_obj: EventFilter_Type, prepend: bool = False):
         """Adds the event filter for this dispatcher
@@ -573,10 +679,11 @@ class MplEventDispatcher:
         if not self._event_filters:
             self._orig_mpl_connections = self._mpl_connections
             self._mpl_connections = {}
+            figure = self._figure()
 
             for event, conn in self._orig_mpl_connections.items():
                 self._mpl_connections[event] = event.make_connection(
-                    self.figure, self._event_filter_proxy, connect=conn.connected)
+                    figure, self._event_filter_proxy, connect=conn.connected)
                 conn.disconnect()
 
         if prepend:
@@ -689,6 +796,9 @@ class MplEventDispatcher:
         """
 
 
+MplEventDispatcher._update_event_handlers()
+
+
 def disable_default_key_press_handler(mpl_obj: MplObject_Type):
     """Disables default key_press handling for given figure/canvas
 
@@ -28,6 +28,9 @@ setup(
     version=_get_version(),
     python_requires=PYTHON_REQUIRES,
     install_requires=['matplotlib >=2.0,<3.8'],
+    extras_require={
+        'tests': ['pytest', 'pytest-xdist'],
+    },
     packages=find_packages(exclude=["tests", "*.tests", "*.tests.*", "tests.*"]),
     url='https://github.com/espdev/mpl-events',
     license='MIT',
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+
+"""
+The shared test fixtures
+
+The figure is created once per test module and all test state is kept in dispatcher instances,
+so the tests can be distributed across processes with pytest-xdist::
+
+    pytest -n auto
+
+"""
+
+import pytest
+
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+
+@pytest.fixture(scope='module')
+def module_figure():
+    # We do not use pyplot and a gui toolkit for testing
+    fig = Figure()
+    FigureCanvasAgg(fig)
+    yield fig
+    fig.canvas.callbacks.callbacks.clear()
+
+
+@pytest.fixture
+def figure(module_figure):
+    callbacks = module_figure.canvas.callbacks.callbacks
+    orig_cids = {event_name: set(cids) for event_name, cids in callbacks.items()}
+
+    yield module_figure
+
+    # Disconnect all handlers that have been connected in a test
+    for event_name, cids in list(callbacks.items()):
+        for cid in set(cids) - orig_cids.get(event_name, set()):
+            module_figure.canvas.mpl_disconnect(cid)
+    module_figure.clf()
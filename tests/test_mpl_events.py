@@ -1,258 +1,382 @@
 # -*- coding: utf-8 -*-
 
-import pytest
+import functools
+import weakref
+from unittest import mock
 
-import matplotlib
-matplotlib.use('Agg')  # We do not use a gui toolkit for testing
-from matplotlib import pyplot
+import pytest
 
 from mpl_events import MplEvent, MplEventConnection, MplEventDispatcher, mpl_event_handler
 from mpl_events import mpl
 
 
-@pytest.fixture
-def figure():
-    fig = pyplot.figure()
-    yield fig
-    pyplot.close(fig)
+EVENT_BUILDERS = {
+    MplEvent.KEY_PRESS: lambda canvas: mpl.KeyEvent(MplEvent.KEY_PRESS.value, canvas, None),
+    MplEvent.KEY_RELEASE: lambda canvas: mpl.KeyEvent(MplEvent.KEY_RELEASE.value, canvas, None),
+
+    MplEvent.MOUSE_BUTTON_PRESS: lambda canvas: mpl.MouseEvent(MplEvent.MOUSE_BUTTON_PRESS.value, canvas, 0, 0),
+    MplEvent.MOUSE_BUTTON_RELEASE: lambda canvas: mpl.MouseEvent(MplEvent.MOUSE_BUTTON_RELEASE.value, canvas, 0, 0),
+    MplEvent.MOUSE_MOVE: lambda canvas: mpl.MouseEvent(MplEvent.MOUSE_MOVE.value, canvas, 0, 0),
+    MplEvent.MOUSE_WHEEL_SCROLL: lambda canvas: mpl.MouseEvent(MplEvent.MOUSE_WHEEL_SCROLL.value, canvas, 0, 0, step=1),
+
+    MplEvent.PICK: lambda canvas: mpl.PickEvent(
+        MplEvent.PICK.value, canvas, mpl.MouseEvent(MplEvent.MOUSE_BUTTON_PRESS.value, canvas, 0, 0), canvas.figure),
+
+    MplEvent.DRAW: lambda canvas: mpl.DrawEvent(MplEvent.DRAW.value, canvas, None),
+
+    MplEvent.FIGURE_CLOSE: lambda canvas: mpl.CloseEvent(MplEvent.FIGURE_CLOSE.value, canvas),
+    MplEvent.FIGURE_RESIZE: lambda canvas: mpl.ResizeEvent(MplEvent.FIGURE_RESIZE.value, canvas),
+
+    MplEvent.FIGURE_ENTER: lambda canvas: mpl.LocationEvent(MplEvent.FIGURE_ENTER.value, canvas, 0, 0),
+    MplEvent.FIGURE_LEAVE: lambda canvas: mpl.LocationEvent(MplEvent.FIGURE_LEAVE.value, canvas, 0, 0),
+
+    MplEvent.AXES_ENTER: lambda canvas: mpl.LocationEvent(MplEvent.AXES_ENTER.value, canvas, 0, 0),
+    MplEvent.AXES_LEAVE: lambda canvas: mpl.LocationEvent(MplEvent.AXES_LEAVE.value, canvas, 0, 0),
+}
+
+
+@functools.lru_cache(maxsize=None)
+def cached_event(canvas, event_type):
+    return EVENT_BUILDERS[event_type](canvas)
+
+
+@pytest.fixture(scope='module', autouse=True)
+def clear_cached_events():
+    yield
+    # The cached events keep the module figure canvas alive
+    cached_event.cache_clear()
+
+
+def make_event_processor(event_type):
+    event_name = event_type.value
+
+    def process_event(canvas):
+        canvas.callbacks.process(event_name, cached_event(canvas, event_type))
+    return process_event
+
+
+PROCESS_EVENTS_PARAM = [(event_type, make_event_processor(event_type)) for event_type in EVENT_BUILDERS]
+
+press_key = make_event_processor(MplEvent.KEY_PRESS)
+release_key = make_event_processor(MplEvent.KEY_RELEASE)
+
+
+class LatestEventDispatcher(MplEventDispatcher):
+    def __init__(self, mpl_obj, connect=True):
+        super().__init__(mpl_obj, connect)
+        self.latest_event = []
+
+    def update_latest(self, event):
+        self.latest_event.append(event.name)
+
+
+# All handler methods share the single "update_latest" function
+AllEventsDispatcher = type('AllEventsDispatcher', (LatestEventDispatcher,), dict.fromkeys(
+    MplEventDispatcher.mpl_event_handlers.values(), LatestEventDispatcher.update_latest))
+
+
+class KeyPressDispatcher(LatestEventDispatcher):
+    def on_key_press(self, event):
+        self.latest_event.append(event.name)
+
+
+class KeyPressReleaseDispatcher(KeyPressDispatcher):
+    def on_key_release(self, event):
+        self.latest_event.append(event.name)
+
+
+class CustomKeyPressDispatcher(LatestEventDispatcher):
+    @mpl_event_handler(MplEvent.KEY_PRESS)
+    def on_key_press_custom(self, event):
+        self.latest_event.append(event.name)
 
+    def on_key_release(self, event):
+        self.latest_event.append(event.name)
 
-PROCESS_EVENTS_PARAM = [
-    (MplEvent.KEY_PRESS, lambda canvas: canvas.key_press_event(None)),
-    (MplEvent.KEY_RELEASE, lambda canvas: canvas.key_release_event(None)),
 
-    (MplEvent.MOUSE_BUTTON_PRESS, lambda canvas: canvas.button_press_event(0, 0, None)),
-    (MplEvent.MOUSE_BUTTON_RELEASE, lambda canvas: canvas.button_release_event(0, 0, None)),
-    (MplEvent.MOUSE_MOVE, lambda canvas: canvas.motion_notify_event(0, 0)),
-    (MplEvent.MOUSE_WHEEL_SCROLL, lambda canvas: canvas.scroll_event(0, 0, 1)),
+class DerivedCustomKeyPressDispatcher(CustomKeyPressDispatcher):
+    def on_key_press_custom(self, event):
+        super().on_key_press_custom(event)
 
-    (MplEvent.PICK, lambda canvas: canvas.pick_event(
-        mpl.MouseEvent(MplEvent.MOUSE_BUTTON_PRESS.value, canvas, 0, 0), canvas.figure)),
+    def on_key_release(self, event):
+        super().on_key_release(event)
 
-    (MplEvent.DRAW, lambda canvas: canvas.draw_event(None)),
 
-    (MplEvent.FIGURE_CLOSE, lambda canvas: canvas.close_event()),
-    (MplEvent.FIGURE_RESIZE, lambda canvas: canvas.resize_event()),
+class EventDispatcher1(LatestEventDispatcher):
+    @mpl_event_handler(MplEvent.KEY_PRESS)
+    def on_key_press_custom(self, event):
+        self.latest_event.append(event.name)
 
-    (MplEvent.FIGURE_ENTER, lambda canvas: canvas.enter_notify_event()),
 
-    (MplEvent.FIGURE_LEAVE, lambda canvas: canvas.callbacks.process(
-        MplEvent.FIGURE_LEAVE.value,
-        mpl.LocationEvent(MplEvent.FIGURE_LEAVE.value, canvas, 0, 0))),
+class EventDispatcher2(LatestEventDispatcher):
+    def on_key_press(self, event):
+        self.latest_event.append(event.name)
 
-    (MplEvent.AXES_ENTER, lambda canvas: canvas.callbacks.process(
-        MplEvent.AXES_ENTER.value,
-        mpl.LocationEvent(MplEvent.AXES_ENTER.value, canvas, 0, 0))),
 
-    (MplEvent.AXES_LEAVE, lambda canvas: canvas.callbacks.process(
-        MplEvent.AXES_LEAVE.value,
-        mpl.LocationEvent(MplEvent.AXES_LEAVE.value, canvas, 0, 0))),
-]
+class EventDispatcher3(LatestEventDispatcher):
+    def on_key_press(self, event):
+        self.latest_event.append(event.name)
 
 
-@pytest.mark.parametrize('event', list(MplEvent))
-def test_event_connection(figure, event: MplEvent):
+def press_and_release_key(canvas):
+    press_key(canvas)
+    release_key(canvas)
+
+
+def test_event_connection(figure):
     def event_handler(e):
         pass
 
-    connection = MplEventConnection(figure, event, event_handler, connect=False)
+    connections = [MplEventConnection(figure, event, event_handler, connect=False) for event in MplEvent]
 
-    connection.connect()
-    assert connection.connected
+    for connection in connections:
+        connection.connect()
+    assert all(connection.connected for connection in connections)
+    assert len({connection.id for connection in connections}) == len(connections)
 
-    connection.disconnect()
-    assert not connection.connected
+    for connection in connections:
+        connection.disconnect()
+    assert not any(connection.connected for connection in connections)
 
 
 @pytest.mark.parametrize('event_type, process_event', PROCESS_EVENTS_PARAM)
 def test_handle_event(figure, event_type, process_event):
-    event = None
-
-    def event_handler(e):
-        nonlocal event
-        event = e.name
+    events = []
 
-    connection = MplEventConnection(figure, event_type, event_handler)
+    connection = MplEventConnection(figure, event_type, lambda e: events.append(e.name))
     assert connection.connected
 
     process_event(figure.canvas)
-    assert event == event_type.value
+    assert events == [event_type.value]
 
 
-@pytest.mark.parametrize('event_type, process_event', PROCESS_EVENTS_PARAM)
-def test_event_dispatcher(figure, event_type, process_event):
+def test_event_dispatcher(figure):
+    dispatcher = AllEventsDispatcher(figure)
 
-    class EventDispatcher(MplEventDispatcher):
-        latest_event = None
+    for event_type, process_event in PROCESS_EVENTS_PARAM:
+        dispatcher.latest_event.clear()
+        process_event(figure.canvas)
 
-        def on_key_press(self, event):
-            self.update_latest(event)
+        assert dispatcher.latest_event == [event_type.value]
 
-        def on_key_release(self, event):
-            self.update_latest(event)
 
-        def on_mouse_button_press(self, event):
-            self.update_latest(event)
+def test_event_dispatcher_inheritance(figure):
+    dispatcher = KeyPressReleaseDispatcher(figure)
 
-        def on_mouse_button_release(self, event):
-            self.update_latest(event)
+    press_and_release_key(figure.canvas)
 
-        def on_mouse_move(self, event):
-            self.update_latest(event)
+    assert dispatcher.latest_event == [MplEvent.KEY_PRESS.value, MplEvent.KEY_RELEASE.value]
 
-        def on_mouse_wheel_scroll(self, event):
-            self.update_latest(event)
 
-        def on_figure_resize(self, event):
-            self.update_latest(event)
+@pytest.mark.parametrize('dispatcher_cls', [
+    CustomKeyPressDispatcher,
+    DerivedCustomKeyPressDispatcher,
+])
+def test_event_dispatcher_change_handler(figure, dispatcher_cls):
+    dispatcher = dispatcher_cls(figure)
 
-        def on_figure_enter(self, event):
-            self.update_latest(event)
+    press_and_release_key(figure.canvas)
 
-        def on_figure_leave(self, event):
-            self.update_latest(event)
+    assert dispatcher.latest_event == [MplEvent.KEY_PRESS.value, MplEvent.KEY_RELEASE.value]
 
-        def on_figure_close(self, event):
-            self.update_latest(event)
 
-        def on_axes_enter(self, event):
-            self.update_latest(event)
+def test_several_event_dispatchers(figure):
+    dispatchers = [cls(figure) for cls in (EventDispatcher1, EventDispatcher2, EventDispatcher3)]
 
-        def on_axes_leave(self, event):
-            self.update_latest(event)
+    press_key(figure.canvas)
 
-        def on_pick(self, event):
-            self.update_latest(event)
+    latest_events = [event for dispatcher in dispatchers for event in dispatcher.latest_event]
+    assert latest_events == [MplEvent.KEY_PRESS.value] * len(dispatchers)
 
-        def on_draw(self, event):
-            self.update_latest(event)
 
-        def update_latest(self, event):
-            if not self.latest_event:
-                self.latest_event = event.name
+FILTER_FLAG = [False]
 
-    dispatcher = EventDispatcher(figure)
 
-    process_event(figure.canvas)
+def event_filter1(obj, event):
+    obj.latest_event.append('filtered1')
+    return FILTER_FLAG[0]
 
-    assert dispatcher.latest_event == event_type.value
 
+def event_filter2(obj, event):
+    obj.latest_event.append('filtered2')
+    return FILTER_FLAG[0]
 
-def test_event_dispatcher_inheritance(figure):
 
-    class EventDispatcher1(MplEventDispatcher):
-        latest_events = []
+@pytest.fixture(scope='module')
+def filtered_dispatcher(module_figure):
+    dispatcher = KeyPressDispatcher(module_figure, connect=False)
 
-        def on_key_press(self, event):
-            self.latest_events.append(event.name)
+    dispatcher.add_event_filter(event_filter1)
+    dispatcher.add_event_filter(event_filter2)
 
-    class EventDispatcher2(EventDispatcher1):
-        def on_key_release(self, event):
-            self.latest_events.append(event.name)
+    return dispatcher
 
-    dispatcher = EventDispatcher2(figure)
 
-    figure.canvas.key_press_event(None)
-    figure.canvas.key_release_event(None)
+@pytest.mark.parametrize('filter_flag, expected', [
+    (False, ['filtered1', 'filtered2', MplEvent.KEY_PRESS.value]),
+    (True, ['filtered1']),
+])
+def test_event_filter(figure, filtered_dispatcher, filter_flag, expected):
+    FILTER_FLAG[0] = filter_flag
+    filtered_dispatcher.latest_event.clear()
 
-    assert dispatcher.latest_events == [MplEvent.KEY_PRESS.value, MplEvent.KEY_RELEASE.value]
+    filtered_dispatcher.mpl_connect()
+    press_key(figure.canvas)
+    filtered_dispatcher.mpl_disconnect()
 
+    assert filtered_dispatcher.latest_event == expected
 
-def test_event_dispatcher_change_handler(figure):
-    class EventDispatcher(MplEventDispatcher):
-        latest_event = []
 
-        @mpl_event_handler(MplEvent.KEY_PRESS)
-        def on_key_press_custom(self, event):
-            self.latest_event.append(event.name)
+def test_event_dispatcher_connects_overridden_handlers(figure):
+    class EventDispatcherBase(MplEventDispatcher):
+        def on_key_press(self, event):
+            pass
 
-        def on_key_release(self, event):
-            self.latest_event.append(event.name)
+    class EventDispatcher(EventDispatcherBase):
+        @mpl_event_handler(MplEvent.KEY_RELEASE)
+        def on_key_release_custom(self, event):
+            pass
 
-    dispatcher = EventDispatcher(figure)
+    base_dispatcher = MplEventDispatcher(figure)
+    dispatcher1 = EventDispatcherBase(figure)
+    dispatcher2 = EventDispatcher(figure)
 
-    figure.canvas.key_press_event(None)
-    figure.canvas.key_release_event(None)
+    assert base_dispatcher.mpl_connections == {}
+    assert list(dispatcher1.mpl_connections) == [MplEvent.KEY_PRESS]
+    assert {event: conn.handler.__name__ for event, conn in dispatcher2.mpl_connections.items()} == {
+        MplEvent.KEY_PRESS: 'on_key_press',
+        MplEvent.KEY_RELEASE: 'on_key_release_custom',
+    }
 
-    assert dispatcher.latest_event == [MplEvent.KEY_PRESS.value, MplEvent.KEY_RELEASE.value]
 
+def test_event_connection_weak_method_handler(figure):
+    class Handler:
+        def on_key_press(self, event):
+            pass
 
-def test_event_dispatcher_change_handler_inheritance(figure):
-    class EventDispatcherBase(MplEventDispatcher):
-        latest_event = []
+    handler_obj = Handler()
+    connection = MplEventConnection(figure, MplEvent.KEY_PRESS, handler_obj.on_key_press)
+    assert connection.connected
 
-        @mpl_event_handler(MplEvent.KEY_PRESS)
-        def on_key_press_custom(self, event):
-            self.latest_event.append(event.name)
+    del handler_obj
+    assert connection.handler is None
+    assert not connection.connected
 
-        def on_key_release(self, event):
-            self.latest_event.append(event.name)
+    connection.connect()
+    assert connection.id == -1
+    assert not connection.connected
 
-    class EventDispatcher(EventDispatcherBase):
-        def on_key_press_custom(self, event):
-            super().on_key_press_custom(event)
 
-        def on_key_release(self, event):
-            super().on_key_release(event)
+def test_event_dispatcher_is_not_kept_alive(figure):
+    class EventDispatcher(MplEventDispatcher):
+        def on_key_press(self, event):
+            pass
 
     dispatcher = EventDispatcher(figure)
+    dispatcher_ref = weakref.ref(dispatcher)
+    cid = dispatcher.mpl_connections[MplEvent.KEY_PRESS].id
 
-    figure.canvas.key_press_event(None)
-    figure.canvas.key_release_event(None)
+    del dispatcher
+    assert dispatcher_ref() is None
+    assert cid not in figure.canvas.callbacks.callbacks[MplEvent.KEY_PRESS.value]
 
-    assert dispatcher.latest_event == [MplEvent.KEY_PRESS.value, MplEvent.KEY_RELEASE.value]
 
+@pytest.mark.parametrize('get_mpl_obj', [
+    lambda figure: figure,
+    lambda figure: figure.canvas,
+    lambda figure: figure.add_subplot(111),
+])
+def test_event_connection_mpl_object(figure, get_mpl_obj):
+    connection = MplEventConnection(get_mpl_obj(figure), MplEvent.KEY_PRESS, lambda e: None)
+    assert connection.figure is figure
 
-def test_several_event_dispatchers(figure):
-    class EventDispatcherBase(MplEventDispatcher):
-        latest_event = []
 
-    class EventDispatcher1(EventDispatcherBase):
+def test_event_connection_invalid_mpl_object():
+    with pytest.raises(TypeError):
+        MplEventConnection(object(), MplEvent.KEY_PRESS, lambda e: None)
+
+
+def test_event_connection_disconnect_on_delete(figure):
+    connection = MplEventConnection(figure, MplEvent.KEY_PRESS, lambda e: None)
+    cid = connection.id
+    assert cid in figure.canvas.callbacks.callbacks[MplEvent.KEY_PRESS.value]
+
+    del connection
+    assert cid not in figure.canvas.callbacks.callbacks[MplEvent.KEY_PRESS.value]
+
+
+def test_event_dispatcher_mixin_handler(figure):
+    events = []
+
+    class KeyPressMixin:
         @mpl_event_handler(MplEvent.KEY_PRESS)
         def on_key_press_custom(self, event):
-            self.latest_event.append(event.name)
+            events.append(event.name)
 
-    class EventDispatcher2(EventDispatcherBase):
-        def on_key_press(self, event):
-            self.latest_event.append(event.name)
+    class EventDispatcher(KeyPressMixin, MplEventDispatcher):
+        pass
+
+    dispatcher = EventDispatcher(figure)
+
+    press_key(figure.canvas)
+
+    assert events == [MplEvent.KEY_PRESS.value]
+    assert list(dispatcher.mpl_connections) == [MplEvent.KEY_PRESS]
+
+
+def test_event_dispatcher_ignores_unmarked_attributes(figure):
+    class EventDispatcher(MplEventDispatcher):
+        helper = mock.MagicMock()
 
-    class EventDispatcher3(EventDispatcherBase):
         def on_key_press(self, event):
-            self.latest_event.append(event.name)
+            pass
 
-    dispatcher1 = EventDispatcher1(figure)
-    dispatcher2 = EventDispatcher2(figure)
-    dispatcher3 = EventDispatcher3(figure)
+    dispatcher = EventDispatcher(figure)
 
-    figure.canvas.key_press_event(None)
+    assert list(dispatcher.mpl_connections) == [MplEvent.KEY_PRESS]
 
-    assert EventDispatcherBase.latest_event == [MplEvent.KEY_PRESS.value] * 3
 
+def test_event_connection_not_weakrefable_method_handler(figure):
+    class Handler:
+        __slots__ = ('events',)
 
-@pytest.mark.parametrize('filter_flag, expected', [
-    (False, ['filtered1', 'filtered2', MplEvent.KEY_PRESS.value]),
-    (True, ['filtered1']),
-])
-def test_event_filter(figure, filter_flag, expected):
-    class EventDispatcher(MplEventDispatcher):
-        latest_event = []
+        def __init__(self):
+            self.events = []
 
         def on_key_press(self, event):
-            self.latest_event.append(event.name)
+            self.events.append(event.name)
+
+    handler_obj = Handler()
+    connection = MplEventConnection(figure, MplEvent.KEY_PRESS, handler_obj.on_key_press)
+    assert connection.connected
+    assert connection.handler == handler_obj.on_key_press
 
-    def event_filter1(obj, event):
-        obj.latest_event.append('filtered1')
-        return filter_flag
+    press_key(figure.canvas)
+    assert handler_obj.events == [MplEvent.KEY_PRESS.value]
 
-    def event_filter2(obj, event):
-        obj.latest_event.append('filtered2')
-        return filter_flag
 
-    dispatcher = EventDispatcher(figure)
+def test_event_dispatcher_handler_assigned_after_class_creation(figure):
+    class EventDispatcher(MplEventDispatcher):
+        pass
 
-    dispatcher.add_event_filter(event_filter1)
-    dispatcher.add_event_filter(event_filter2)
+    EventDispatcher.on_key_press = lambda self, event: None
+
+    assert EventDispatcher(figure).mpl_connections == {}
+
+
+def test_event_dispatcher_class_body_event_handlers(figure):
+    events = []
+
+    class EventDispatcher(MplEventDispatcher):
+        mpl_event_handlers = {MplEvent.KEY_PRESS: 'handle'}
+
+        def handle(self, event):
+            events.append(event.name)
+
+    dispatcher = EventDispatcher(figure)
 
-    figure.canvas.key_press_event(None)
+    press_key(figure.canvas)
 
-    assert dispatcher.latest_event == expected
+    assert EventDispatcher.mpl_event_handlers == {MplEvent.KEY_PRESS: 'handle'}
+    assert list(dispatcher.mpl_connections) == [MplEvent.KEY_PRESS]
+    assert events == [MplEvent.KEY_PRESS.value]